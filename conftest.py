@@ -0,0 +1,8 @@
+import os
+import tempfile
+
+if os.name == 'posix' and os.path.isdir('/dev/shm'):
+    # Keep the test working set on tmpfs: every temp directory the tests
+    # make, and every temp file safer makes inside one, then skips the
+    # block layer entirely
+    tempfile.tempdir = '/dev/shm'
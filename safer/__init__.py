@@ -149,20 +149,62 @@ With `safer`
 """
 from __future__ import annotations
 
-import contextlib
+import builtins
 import functools
 import io
 import os
-import shutil
+import stat
 import sys
-import tempfile
-import traceback
 import typing as t
 from pathlib import Path
 
+# shutil, tempfile and traceback are imported lazily, at their points of
+# use: they pull in a surprising number of modules, and many programs that
+# import safer never hit the code paths that need them
+
 __all__ = 'writer', 'open', 'closer', 'dump', 'printer'
 
 
+class _Mode(t.NamedTuple):
+    read: bool
+    binary: bool
+    copy: bool
+    plus: bool
+    exclusive: bool
+    text: bool
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_mode(mode: str) -> _Mode:
+    # A single pass over the characters instead of one scan per flag
+    chars = frozenset(mode)
+    copy = '+' in chars or 'a' in chars
+    return _Mode(
+        read='r' in chars and not copy,
+        binary='b' in chars,
+        copy=copy,
+        plus='+' in chars,
+        exclusive='x' in chars,
+        text='t' in chars,
+    )
+
+
+# Scanning the mode string several times per call adds up, and the legal
+# mode strings are a tiny set, so parse them all once up front
+_MODE_FLAGS = {
+    m + b: _parse_mode(m + b)
+    for m in ('r', 'w', 'a', 'x', 'r+', 'w+', 'a+', 'x+')
+    for b in ('', 'b', 't')
+}
+
+
+def _mode_flags(mode: str) -> _Mode:
+    return _MODE_FLAGS.get(mode) or _parse_mode(mode)
+
+
+_WRITE_CHARS = frozenset('w+a')
+
+
 def writer(
     stream: t.Callable | None | t.IO | Path | str = None,
     is_binary: bool | None = None,
@@ -170,6 +212,7 @@ def writer(
     temp_file: bool = False,
     chunk_size: int = 0x100000,
     delete_failures: bool = True,
+    spool_max: int = 0,
     dry_run: bool | t.Callable = False,
     enabled: bool = True,
 ) -> t.Callable | t.IO:
@@ -213,6 +256,10 @@ def writer(
       delete_failures: If false, any temporary files created are not deleted
         if there is an exception.
 
+      spool_max: If nonzero, writes are spooled in memory and only rolled
+          over to a disk file once they exceed `spool_max` bytes, so failed
+          or small writes never touch the disk.  Overrides `temp_file`.
+
       dry_run: If `dry_run` is truthy, the stream or file is left unchanged.
 
         If `dry_run` is also callable, the results of the stream are passed to
@@ -220,7 +267,7 @@ def writer(
 
       enabled: If `enabled` is falsey, the stream is returned unchanged
     """
-    if isinstance(stream, (str, Path)):
+    if isinstance(stream, (str, os.PathLike)):
         return open(
             stream,
             'wb' if is_binary else 'w',
@@ -248,14 +295,6 @@ def writer(
         elif dry_run:
             write = len
 
-        elif close_on_exit and hasattr(stream, 'write'):
-            if temp_file and BUG_MESSAGE:
-                raise NotImplementedError(BUG_MESSAGE)
-
-            def write(v):
-                with stream:
-                    stream.write(v)
-
         else:
             write = getattr(stream, 'write', None)
 
@@ -263,7 +302,7 @@ def writer(
         mode = getattr(stream, 'mode', None)
 
         if write and mode:
-            if not set('w+a').intersection(mode):
+            if not _WRITE_CHARS.intersection(mode):
                 raise ValueError(f'Stream mode "{mode}" is not a write mode')
 
             binary_mode = 'b' in mode
@@ -290,7 +329,13 @@ def writer(
 
         closer: _StreamCloser
 
-        if temp_file:
+        if dry_run and write is len:
+            closer = _NullStreamCloser(write, close_on_exit, is_binary)
+        elif spool_max:
+            closer = _SpooledStreamCloser(
+                write, close_on_exit, is_binary, spool_max, chunk_size
+            )
+        elif temp_file:
             closer = _FileStreamCloser(
                 write,
                 close_on_exit,
@@ -313,11 +358,6 @@ def writer(
         raise
 
 
-# There's an edge case in #23 I can't yet fix, so I fail
-# deliberately
-BUG_MESSAGE = 'Sorry, safer.writer fails if temp_file (#23)'
-
-
 def open(
     name: Path | str,
     mode: str = 'r',
@@ -330,6 +370,13 @@ def open(
     make_parents: bool = False,
     delete_failures: bool = True,
     temp_file: bool = False,
+    unnamed_temp_file: bool = False,
+    spool_max: int = 0,
+    expected_size: int = 0,
+    swap_atomic: bool = False,
+    fsync: bool = False,
+    write_through: bool = False,
+    expected_sha256: str = '',
     dry_run: bool | t.Callable = False,
     enabled: bool = True,
 ) -> t.IO:
@@ -347,6 +394,47 @@ def open(
          file, otherwise select one in the same directory as the target
          file, or in the system tempfile for streams that aren't files.
 
+      unnamed_temp_file: If true, and the platform supports Linux's
+         `O_TMPFILE`, the temporary file is an unnamed inode in the target
+         directory: it never appears in directory listings, and the kernel
+         reclaims it automatically if the process crashes.  Implies
+         `temp_file`.  Falls back to a named temporary file where
+         unsupported, or when the file is opened in a copy mode.
+
+      spool_max: If nonzero, the in-memory cache is spooled: writes stay in
+         memory until they exceed `spool_max` bytes, then roll over to a
+         disk file, bounding peak memory use for large writes.  Ignored
+         when `temp_file` is set, which never buffers in memory.
+
+      expected_size: A hint of the final file size, in bytes, for
+         sequential writes with `temp_file`.  Where the platform supports
+         it, that much space is preallocated in one contiguous extent,
+         instead of being grown write by write; any overshoot is trimmed
+         when the file is published.
+
+      swap_atomic: If true and the platform supports it, atomically exchange
+         the temporary file with the target file using Linux's
+         `renameat2(RENAME_EXCHANGE)`, so that readers never observe a
+         moment where the target file is missing.  Requires `temp_file`.
+         Falls back to `os.replace()` where unsupported.
+
+      fsync: If true, the temporary file's data is flushed to permanent
+         storage with `os.fsync` before it replaces the target file, and the
+         parent directory is flushed afterwards to persist the rename, so
+         the whole write survives a crash or power loss.  A rename alone
+         guarantees atomicity but not durability.  Requires `temp_file`.
+
+      write_through: If true, text written to a `temp_file` stream is passed
+         straight through to the underlying binary buffer instead of being
+         held in the text layer's own small write buffer - useful for
+         low-latency logging.  Only valid in text mode.
+
+      expected_sha256: If set, the temp file is read back and its SHA-256
+         hex digest compared against this value before it replaces the
+         target; on a mismatch the write fails with an IOError and the
+         target is untouched.  Catches silent corruption between write
+         and rename.  Requires `temp_file`.
+
       dry_run: If `dry_run` is truthy, the file is not written at all
          If `dry_run` is also callable, the results are passed to `dry_run()`
          rather than being written.
@@ -355,7 +443,9 @@ def open(
          If `enabled` is falsey, safer is entirely bypassed, and
          built-in `open()` is used instead.
 
-    The remaining arguments are the same as for built-in `open()`.
+    The remaining arguments are the same as for built-in `open()`.  As
+    with built-in `open()`, passing `buffering=0` in binary mode skips the
+    buffer layer entirely, which suits callers that write in large chunks.
 
     `safer.open() is a drop-in replacement for built-in`open()`. It returns a
     stream which only overwrites the original file when close() is called, and
@@ -383,27 +473,52 @@ def open(
     without failing. This uses as much disk space as the old and new files put
     together.
     """
-    is_copy = '+' in mode or 'a' in mode
-    is_read = 'r' in mode and not is_copy
-    is_binary = 'b' in mode
+    flags = _mode_flags(mode)
+    is_copy = flags.copy
+    is_read = flags.read
+    is_binary = flags.binary
 
-    kwargs = dict(encoding=encoding, errors=errors, newline=newline, opener=opener)
+    kwargs: t.Dict[str, t.Any] = dict(
+        encoding=encoding, errors=errors, newline=newline, opener=opener
+    )
 
-    if isinstance(name, Path):
-        name = str(name)
+    if unnamed_temp_file:
+        temp_file = temp_file or True
 
     if not isinstance(name, str):
-        raise TypeError(f'`name` must be string, not {type(name).__name__}')
+        # os.fspath covers Path and any other __fspath__ type; plain
+        # strings skip the call entirely
+        if isinstance(name, os.PathLike):
+            name = os.fspath(name)
+        else:
+            raise TypeError(f'`name` must be string, not {type(name).__name__}')
+
+    # One lstat answers every question asked below; realpath walks and
+    # stats every path component, so only pay for it when the target is
+    # actually a symlink, whose resolved file is what gets replaced
+    try:
+        target_st = os.lstat(name)
+    except FileNotFoundError:
+        target_st = None
+
+    if target_st is not None and stat.S_ISLNK(target_st.st_mode):
+        name = os.path.realpath(name)
+        try:
+            target_st = os.stat(name)
+        except FileNotFoundError:
+            target_st = None
+    else:
+        name = os.path.abspath(name)
+
+    parent = os.path.dirname(name)
 
-    name = os.path.realpath(name)
-    parent = os.path.dirname(os.path.abspath(name))
-    if not os.path.exists(parent):
-        if not make_parents:
-            raise IOError('Directory does not exist')
-        os.makedirs(parent)
+    # A missing parent directory surfaces naturally as FileNotFoundError
+    # from the temp file or the final write, so there's no stat to check it
+    if target_st is None and make_parents:
+        os.makedirs(parent, exist_ok=True)
 
     def simple_open():
-        return __builtins__['open'](name, mode, buffering, **kwargs)
+        return builtins.open(name, mode, buffering, **kwargs)
 
     def simple_write(value):
         with simple_open() as fp:
@@ -413,7 +528,7 @@ def open(
         return simple_open()
 
     if not temp_file:
-        if '+' in mode:
+        if flags.plus:
             raise ValueError('+ mode requires a temp_file argument')
 
         if callable(dry_run):
@@ -421,7 +536,16 @@ def open(
         else:
             write = len if dry_run else simple_write
 
-        fp = _MemoryStreamCloser(write, True, is_binary).fp
+        stream_closer: _StreamCloser
+        if write is len:
+            stream_closer = _NullStreamCloser(write, True, is_binary)
+        elif spool_max:
+            stream_closer = _SpooledStreamCloser(
+                write, True, is_binary, spool_max, 0x100000
+            )
+        else:
+            stream_closer = _MemoryStreamCloser(write, True, is_binary)
+        fp = stream_closer.fp
         fp.mode = mode
         return fp
 
@@ -429,7 +553,7 @@ def open(
         raise ValueError('Cannot use closefd=False with file name')
 
     if is_binary:
-        if 't' in mode:
+        if flags.text:
             raise ValueError("can't have text and binary mode at once")
         if newline:
             raise ValueError("binary mode doesn't take a newline argument")
@@ -437,19 +561,40 @@ def open(
             raise ValueError("binary mode doesn't take an encoding argument")
         if errors:
             raise ValueError("binary mode doesn't take an errors argument")
+        if write_through:
+            raise ValueError("binary mode doesn't take a write_through argument")
 
-    if 'x' in mode and os.path.exists(name):
+    if flags.exclusive and target_st is not None:
         raise FileExistsError(f"File exists: '{name}'")
 
-    if buffering == -1:
-        buffering = io.DEFAULT_BUFFER_SIZE
+    if write_through:
+        kwargs['write_through'] = True
 
     closer = _FileRenameCloser(
-        name, temp_file, delete_failures, parent, dry_run, is_binary
+        name,
+        temp_file,
+        delete_failures,
+        parent,
+        dry_run,
+        is_binary,
+        swap_atomic,
+        unnamed_temp_file and not is_copy,
+        fsync,
+        None if target_st is None else target_st.st_mode,
+        flags.exclusive,
+        0 if is_copy else expected_size,
+        expected_sha256,
     )
 
-    if is_copy and os.path.exists(name):
-        shutil.copy2(name, closer.temp_file)
+    if is_copy and target_st is not None:
+        _copy_file(name, closer.temp_file)
+
+    if buffering == -1:
+        # Writing in filesystem-block-sized chunks needs fewer syscalls
+        # than io's 8 KiB default when the blocks are bigger
+        st = os.fstat(closer.temp_fd) if closer.temp_fd is not None else target_st
+        blksize = getattr(st, 'st_blksize', 0) if st is not None else 0
+        buffering = max(blksize, io.DEFAULT_BUFFER_SIZE)
 
     return closer._make_stream(buffering, mode, **kwargs)
 
@@ -494,42 +639,66 @@ def dump(
       kwargs:
         Additional arguments to `dump`.
     """
-    if not isinstance(stream, str):
-        name = getattr(stream, 'name', '')
-        mode = getattr(stream, 'mode', '')
-        if name and mode:
-            is_binary = 'b' in mode
-        else:
-            is_binary = hasattr(stream, 'recv') and hasattr(stream, 'send')
+    if isinstance(stream, (str, os.PathLike)):
+        # Serialize straight into the on-disk temp file, instead of
+        # buffering the whole payload in memory and copying it over
+        name = os.fspath(stream)
+        dump = _get_dumper(dump or Path(name).suffix[1:])
+        with open(name, 'w', temp_file=True) as fp:
+            return dump(obj, fp)
+
+    name = getattr(stream, 'name', '')
+    mode = getattr(stream, 'mode', '')
+    if name and mode:
+        is_binary = 'b' in mode
     else:
-        name = stream
-        is_binary = False
+        is_binary = hasattr(stream, 'recv') and hasattr(stream, 'send')
 
     dump = _get_dumper(dump or Path(name).suffix[1:])
 
     with t.cast(t.IO, writer(stream)) as fp:
-        if is_binary:
-            write = fp.write
-            fp.write = lambda s: write(s.encode('utf-8'))  # type: ignore
+        if not is_binary:
+            return dump(obj, fp)
 
-        return dump(obj, fp)
+        # A real TextIOWrapper encodes in C, instead of paying a Python
+        # lambda and a bytes allocation for every fragment the dumper writes
+        text_fp = io.TextIOWrapper(fp, encoding='utf-8', write_through=True)
+        try:
+            return dump(obj, text_fp)
+        finally:
+            text_fp.detach()
 
 
 def _get_dumper(dump: t.Any) -> t.Callable:
-    if isinstance(dump, str):
-        if not dump:
-            dump = 'json'
-        elif dump == 'yml':
-            dump = 'yaml'
+    if not isinstance(dump, str):
+        return _dump_callable(dump)
 
-        try:
-            dump = __import__(dump)
-        except ImportError:
-            if '.' not in dump:
-                raise
-            mod, name = dump.rsplit('.', maxsplit=1)
-            dump = getattr(__import__(mod), name)
+    # Named dumpers resolve to the same callable every time, so pay for
+    # the import and attribute walk once per name
+    try:
+        return _DUMPER_CACHE[dump]
+    except KeyError:
+        pass
+
+    key = dump
+    if not dump:
+        dump = 'json'
+    elif dump == 'yml':
+        dump = 'yaml'
 
+    try:
+        dump = __import__(dump)
+    except ImportError:
+        if '.' not in dump:
+            raise
+        mod, name = dump.rsplit('.', maxsplit=1)
+        dump = getattr(__import__(mod), name)
+
+    dumper = _DUMPER_CACHE[key] = _dump_callable(dump)
+    return dumper
+
+
+def _dump_callable(dump: t.Any) -> t.Callable:
     if callable(dump):
         return dump
 
@@ -539,10 +708,12 @@ def _get_dumper(dump: t.Any) -> t.Callable:
         return dump.dump
 
 
-@contextlib.contextmanager
+_DUMPER_CACHE: t.Dict[str, t.Callable] = {}
+
+
 def printer(
     name: Path | str, mode: str = 'w', *args, **kwargs
-) -> t.Iterator[t.Callable]:
+) -> t.ContextManager[t.Callable]:
     """
     A context manager that yields a function that prints to the opened file,
     only writing to the original file at the exit of the context,
@@ -551,14 +722,102 @@ def printer(
     ARGUMENTS
       Same as for `safer.open()`
     """
-    if 'r' in mode and '+' not in mode:
+    flags = _mode_flags(mode)
+    if flags.read:
         raise IOError('File not open for writing')
 
-    if 'b' in mode:
+    if flags.binary:
         raise ValueError('Cannot print to a file open in binary mode')
 
-    with open(name, mode, *args, **kwargs) as fp:
-        yield functools.partial(print, file=fp)
+    return _Printer(open(name, mode, *args, **kwargs))
+
+
+class _Printer:
+    # A plain class costs less to enter and exit than a generator-based
+    # context manager, and the underlying stream's __exit__ is C code
+    def __init__(self, fp):
+        self.fp = fp
+
+    def __enter__(self):
+        return functools.partial(print, file=self.fp)
+
+    def __exit__(self, *args):
+        return self.fp.__exit__(*args)
+
+
+def _copy_file(src, dst):
+    """Copy contents and metadata of `src` over `dst`.
+
+    A `FICLONE` reflink is free on copy-on-write filesystems, and
+    `os.copy_file_range` copies entirely inside the kernel; fall back to
+    `shutil.copy2`, which has fast paths of its own, everywhere else.
+    """
+    import shutil
+
+    try:
+        if _kernel_copy(src, dst):
+            shutil.copystat(src, dst)
+            return
+    except OSError:
+        pass
+
+    shutil.copy2(src, dst)
+
+
+def _kernel_copy(src, dst):
+    sfd = os.open(src, os.O_RDONLY)
+    try:
+        dfd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, _CREATE_MODE)
+        try:
+            if _reflink(sfd, dfd):
+                return True
+            size = os.fstat(sfd).st_size
+            if hasattr(os, 'copy_file_range'):
+                remaining = size
+                while remaining > 0:
+                    copied = os.copy_file_range(sfd, dfd, remaining)
+                    if not copied:  # pragma: no cover
+                        return False
+                    remaining -= copied
+                return True
+            if hasattr(os, 'sendfile'):  # pragma: no cover
+                offset = 0
+                while offset < size:
+                    sent = os.sendfile(dfd, sfd, offset, size - offset)
+                    if not sent:
+                        return False
+                    offset += sent
+                return True
+            return False
+        finally:
+            os.close(dfd)
+    finally:
+        os.close(sfd)
+
+
+def _reflink(sfd, dfd):
+    """Clone one fd's contents to another, instantly, on CoW filesystems"""
+    if sys.platform != 'linux':
+        return False
+
+    import fcntl
+
+    try:
+        fcntl.ioctl(dfd, _FICLONE, sfd)
+        return True
+    except OSError:
+        return False
+
+
+def _create_mode():
+    # Reading the umask is itself a syscall, so do it once at import time
+    saved = os.umask(0)
+    os.umask(saved)
+    return 0o666 & ~saved
+
+
+# What built-in open() would give a newly created file
+_CREATE_MODE = _create_mode()
 
 
 class _Closer:
@@ -569,6 +828,8 @@ class _Closer:
             try:
                 self._close(True)
             except Exception:
+                import traceback
+
                 traceback.print_exc()
             raise
         self._close(self.fp.safer_failed)
@@ -586,45 +847,74 @@ class _Closer:
         pass
 
     def _wrap(self, stream_cls):
-        @functools.wraps(stream_cls)
+        wrapped_cls = _wrap_class(stream_cls)
+
         def wrapped(*args, **kwargs):
-            wrapped_cls = _wrap_class(stream_cls)
-            self.fp = wrapped_cls(*args, **kwargs)
-            self.fp.safer_closer = self
-            self.fp.safer_failed = False
-            return self.fp
+            fp = wrapped_cls(*args, **kwargs)
+            fp.safer_closer = self
+            fp.safer_failed = False
+            self.fp = fp
+            return fp
 
         return wrapped
 
 
 # Wrap an existing IO class so that it calls safer at the end
-@functools.lru_cache()
 def _wrap_class(stream_cls):
-    @functools.wraps(stream_cls.__exit__)
+    try:
+        return _WRAPPED_CLASSES[stream_cls]
+    except KeyError:
+        pass
+
     def exit(self, *args):
         self.safer_failed = bool(args[0])
         return stream_cls.__exit__(self, *args)
 
-    @functools.wraps(stream_cls.close)
     def close(self):
         self.safer_closer.close(stream_cls.close)
 
     members = {'__exit__': exit, 'close': close}
-    return type('Safer' + stream_cls.__name__, (stream_cls,), members)
+    wrapped = type('Safer' + stream_cls.__name__, (stream_cls,), members)
+    _WRAPPED_CLASSES[stream_cls] = wrapped
+    return wrapped
+
+
+# Creating a class is costly - it invalidates the global method cache - so
+# build the ones every call path uses once, at import
+_WRAPPED_CLASSES: t.Dict[type, type] = {}
+for _cls in (
+    io.StringIO,
+    io.BytesIO,
+    io.TextIOWrapper,
+    io.FileIO,
+    io.BufferedWriter,
+    io.BufferedRandom,
+):
+    _wrap_class(_cls)
+del _cls
 
 
 class _FileCloser(_Closer):
+    temp_fd = None
+    closefd = True
+
     def __init__(self, temp_file, delete_failures, parent=None):
         if temp_file is True:
-            fd, temp_file = tempfile.mkstemp(dir=parent)
-            os.close(fd)
+            import tempfile
+
+            # Keep the mkstemp fd: _make_stream wraps it directly, saving a
+            # pointless close and a second open of the same file
+            self.temp_fd, temp_file = tempfile.mkstemp(dir=parent)
 
         self.temp_file = temp_file
         self.delete_failures = delete_failures
 
     def _failure(self):
         if self.delete_failures:
-            os.remove(self.temp_file)
+            try:
+                os.remove(self.temp_file)
+            except FileNotFoundError:
+                pass
         else:
             print('Temp_file saved:', self.temp_file, file=sys.stderr)
 
@@ -643,7 +933,15 @@ class _FileCloser(_Closer):
 
         new_mode = mode.replace('x', 'w').replace('t', '')
         opener = kwargs.pop('opener', None)
-        fp = makers.pop(0)(self.temp_file, new_mode, opener=opener)
+        if self.temp_fd is not None and ('+' in mode or 'a' in mode):
+            # Append and update modes need the O_APPEND or truncation
+            # semantics of a fresh open, which a raw fd cannot provide
+            os.close(self.temp_fd)
+            self.temp_fd = None
+        if self.temp_fd is None:
+            fp = makers.pop(0)(self.temp_file, new_mode, opener=opener)
+        else:
+            fp = makers.pop(0)(self.temp_fd, new_mode, closefd=self.closefd)
 
         if buffering > 1:
             fp = makers.pop(0)(fp, buffering)
@@ -664,25 +962,199 @@ class _FileRenameCloser(_FileCloser):
         parent,
         dry_run,
         is_binary,
+        swap_atomic=False,
+        unnamed=False,
+        fsync=False,
+        target_mode=None,
+        exclusive=False,
+        expected_size=0,
+        expected_sha256='',
     ):
         self.target_file = target_file
         self.dry_run = dry_run
         self.is_binary = is_binary
+        self.swap_atomic = swap_atomic
+        self.fsync = fsync
+        self.target_mode = target_mode
+        self.exclusive = exclusive
+        self.expected_sha256 = expected_sha256
+        fd = None
+        self.unnamed = False
         if temp_file is True:
             parent, file = os.path.split(target_file)
-            temp_file = os.path.join(parent, f'.{file}.tmp-safer')
+            if unnamed and _O_TMPFILE:
+                try:
+                    fd = os.open(parent or os.curdir, _O_TMPFILE | os.O_WRONLY, 0o666)
+                except OSError:
+                    fd = None
+            if fd is None:
+                import tempfile
+
+                # A random name, like tempfile's own, keeps the expected
+                # number of collisions at zero however many writers share
+                # the directory
+                fd, temp_file = tempfile.mkstemp(
+                    prefix=f'.{file}.', suffix='.tmp-safer', dir=parent or None
+                )
+            else:
+                self.unnamed = True
+                temp_file = f'/proc/self/fd/{fd}'
 
         super().__init__(temp_file, delete_failures, parent)
+        self.temp_fd = fd
+        # The fd outlives its stream: it's used to publish the file
+        self.closefd = False
+
+        self.expected_size = expected_size
+        if expected_size and fd is not None and hasattr(os, 'posix_fallocate'):
+            try:
+                os.posix_fallocate(fd, 0, expected_size)
+            except OSError:  # pragma: no cover
+                self.expected_size = 0
 
     def _success(self):
-        if not self.dry_run:
+        try:
+            if not self.dry_run:
+                self._replace_target()
+
+            elif callable(self.dry_run):
+                # builtins.open: safer's open() would realpath an unnamed
+                # temp file's /proc/self/fd name into a deleted inode
+                mode = 'rb' if self.is_binary else 'r'
+                with builtins.open(self.temp_file, mode) as fp:
+                    self.dry_run(fp.read())
+        finally:
+            if self.temp_fd is not None:
+                os.close(self.temp_fd)
+                self.temp_fd = None
+
+    def _replace_target(self):
+        if self.expected_sha256:
+            self._verify()
+
+        if self.expected_size and self.temp_fd is not None:
+            # Trim preallocated space past what was actually written
+            pos = os.lseek(self.temp_fd, 0, os.SEEK_CUR)
+            if pos < os.fstat(self.temp_fd).st_size:
+                os.ftruncate(self.temp_fd, pos)
+
+        if self.fsync:
+            self._fsync_temp_file()
+
+        exchanged = False
+        if self.target_mode is not None:
+            self._chmod_temp_file(self.target_mode & 0o7777)
+            if self.swap_atomic and not self.unnamed:
+                exchanged = _exchange(self.temp_file, self.target_file)
+                if exchanged:
+                    os.remove(self.temp_file)
+        elif not self.unnamed:
+            # mkstemp creates files 0o600; match what built-in open() gives
+            self._chmod_temp_file(_CREATE_MODE)
+
+        if not exchanged:
+            if self.unnamed:
+                self._publish_unnamed()
+            elif self.exclusive:
+                self._publish_exclusive()
+            else:
+                os.replace(self.temp_file, self.target_file)
+
+        if self.fsync:
+            _fsync_directory(os.path.dirname(self.target_file))
+
+    def _verify(self):
+        import hashlib
+
+        with builtins.open(self.temp_file, 'rb') as fp:
+            if hasattr(hashlib, 'file_digest'):
+                digest = hashlib.file_digest(fp, 'sha256').hexdigest()
+            else:
+                sha = hashlib.sha256()
+                while block := fp.read(0x10000):
+                    sha.update(block)
+                digest = sha.hexdigest()
+
+        if digest != self.expected_sha256:
+            self._failure()
+            raise IOError(f"Checksum mismatch writing '{self.target_file}'")
+
+    def _chmod_temp_file(self, mode):
+        if self.temp_fd is not None:
+            os.fchmod(self.temp_fd, mode)
+        else:
+            os.chmod(self.temp_file, mode)
+
+    def _fsync_temp_file(self):
+        if self.temp_fd is not None:
+            os.fsync(self.temp_fd)
+            return
+        fd = os.open(self.temp_file, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _publish_exclusive(self):
+        # 'x' mode was checked when the file opened, but another process
+        # might have created the target since.  Linking fails atomically if
+        # the name now exists, so there is no check-then-rename window.
+        try:
+            os.link(self.temp_file, self.target_file)
+        except FileExistsError:
+            self._failure()
+            raise
+        except OSError:
+            # No hard links on this filesystem: fall back to check-then-move
             if os.path.exists(self.target_file):
-                shutil.copymode(self.target_file, self.temp_file)
+                self._failure()
+                raise FileExistsError(f"File exists: '{self.target_file}'")
             os.replace(self.temp_file, self.target_file)
+        else:
+            os.remove(self.temp_file)
+
+    def _publish_unnamed(self):
+        # Give the anonymous inode the target name, atomically if possible
+        try:
+            os.link(self.temp_file, self.target_file, follow_symlinks=True)
+            return
+        except FileExistsError:
+            if self.exclusive:
+                # Another process created the target since the 'x' check
+                self._failure()
+                raise
+        except OSError:
+            pass
 
-        elif callable(self.dry_run):
-            with open(self.temp_file, 'rb' if self.is_binary else 'r') as fp:
-                self.dry_run(fp.read())
+        named = f'{self.target_file}.{os.getpid()}.tmp-safer'
+        try:
+            os.link(self.temp_file, named, follow_symlinks=True)
+        except OSError:
+            # Some filesystems (e.g. overlayfs) cannot link an unnamed
+            # inode back into a directory, so copy it out instead
+            import shutil
+
+            shutil.copy2(self.temp_file, named)
+        os.replace(named, self.target_file)
+
+    def _failure(self):
+        if not self.unnamed:
+            if self.temp_fd is not None:
+                os.close(self.temp_fd)
+                self.temp_fd = None
+            super()._failure()
+            return
+
+        if not self.delete_failures:
+            named = f'{self.target_file}.{os.getpid()}.tmp-safer'
+            try:
+                os.link(self.temp_file, named, follow_symlinks=True)
+            except OSError:  # pragma: no cover
+                pass
+            else:
+                print('Temp_file saved:', named, file=sys.stderr)
+        os.close(self.temp_fd)
+        self.temp_fd = None
 
 
 class _StreamCloser(_Closer):
@@ -697,13 +1169,55 @@ class _StreamCloser(_Closer):
             closer = getattr(self.write, 'close', None)
             if closer:
                 closer(self.fp.safer_failed)
+            else:
+                # A bound write method: close its stream, once, at the end.
+                # Wrapping each chunk in `with stream:` closed the stream
+                # after the first one, which is what broke temp_file (#23)
+                stream = getattr(self.write, '__self__', None)
+                closer = getattr(stream, 'close', None)
+                if closer:
+                    closer()
 
     def _write_on_success(self, v):
-        while True:
-            written = self.write(v)
-            v = (written is not None) and v[written:]
-            if not v:
-                break
+        written = self.write(v)
+        if written is None or written >= len(v):
+            return
+
+        # Partial write: advance an offset rather than rebuilding the
+        # tail, which is quadratic; for bytes a memoryview makes each
+        # continuation slice free
+        if isinstance(v, (bytes, bytearray)):
+            v = memoryview(v)
+        off = written
+        while off < len(v):
+            written = self.write(v[off:])
+            if written is None:
+                return
+            off += written
+
+
+class _NullTextIO(io.TextIOBase):
+    def write(self, v):
+        return len(v)
+
+
+class _NullBytesIO(io.RawIOBase):
+    def writable(self):
+        return True
+
+    def write(self, v):
+        return len(v)
+
+
+class _NullStreamCloser(_StreamCloser):
+    # A dry run that nobody reads doesn't need the data kept at all
+    def __init__(self, write, close_on_exit, is_binary):
+        super().__init__(write, close_on_exit)
+        fp = self._wrap(_NullBytesIO if is_binary else _NullTextIO)()
+        assert fp == self.fp
+
+    def _success(self):
+        pass
 
 
 class _MemoryStreamCloser(_StreamCloser):
@@ -721,6 +1235,58 @@ class _MemoryStreamCloser(_StreamCloser):
         self._write_on_success(self.value)
 
 
+@functools.lru_cache()
+def _spooled_class():
+    import tempfile
+
+    class SpooledTemporaryFile(tempfile.SpooledTemporaryFile):
+        # The base __exit__ closes the inner file directly, bypassing
+        # close() and with it the safer hook, so route it through close()
+        def __exit__(self, *args):
+            self.close()
+
+        # The base class's mode is a read-only property; open() expects to
+        # stamp the caller's mode string onto the stream it hands back
+        _mode = None
+
+        @property
+        def mode(self):
+            if self._mode is None:
+                return super().mode
+            return self._mode
+
+        @mode.setter
+        def mode(self, value):
+            self._mode = value
+
+    return SpooledTemporaryFile
+
+
+class _SpooledStreamCloser(_StreamCloser):
+    def __init__(self, write, close_on_exit, is_binary, spool_max, chunk_size):
+        super().__init__(write, close_on_exit)
+
+        self.chunk_size = chunk_size
+        mode = 'w+b' if is_binary else 'w+'
+        fp = self._wrap(_spooled_class())(spool_max, mode)
+        assert fp == self.fp
+
+    def close(self, parent_close):
+        # The spooled data is only reachable while the file is open, so
+        # drain it to the target before the parent's close discards it
+        if not self.fp.safer_failed:
+            self.fp.seek(0)
+            while True:
+                data = self.fp.read(self.chunk_size)
+                if not data:
+                    break
+                self._write_on_success(data)
+        super().close(parent_close)
+
+    def _success(self):
+        pass
+
+
 class _FileStreamCloser(_StreamCloser, _FileCloser):
     def __init__(
         self,
@@ -741,13 +1307,112 @@ class _FileStreamCloser(_StreamCloser, _FileCloser):
         self.fp = self._make_stream(-1, mode)
 
     def _success(self):
-        mode = 'rb' if self.is_binary else 'r'
-        with open(self.temp_file, mode) as fp:
+        if self.is_binary:
+            if self._sendfile():
+                return
+
+            # One reusable buffer instead of a fresh bytes per chunk, and
+            # no buffered layer between the file and the transfer loop
+            buf = bytearray(self.chunk_size)
+            view = memoryview(buf)
+            with io.FileIO(self.temp_file) as fp:
+                while n := fp.readinto(buf):
+                    self._write_on_success(view[:n].tobytes())
+            return
+
+        with open(self.temp_file) as fp:
             while True:
                 data = fp.read(self.chunk_size)
                 if not data:
                     break
                 self._write_on_success(data)
 
+    def _sendfile(self):
+        """Copy the temp file kernel-side when the target has a real fd"""
+        if not hasattr(os, 'sendfile'):  # pragma: no cover
+            return False
+
+        target = getattr(self.write, '__self__', None)
+        fileno = getattr(target, 'fileno', None)
+        if fileno is None:
+            return False
+
+        try:
+            dfd = fileno()
+            flush = getattr(target, 'flush', None)
+            if flush:
+                flush()
+        except (OSError, ValueError):
+            return False
+
+        sfd = os.open(self.temp_file, os.O_RDONLY)
+        try:
+            size = os.fstat(sfd).st_size
+            offset = 0
+            while offset < size:
+                try:
+                    sent = os.sendfile(dfd, sfd, offset, size - offset)
+                except OSError:
+                    if offset:  # pragma: no cover
+                        raise
+                    return False
+                if not sent:  # pragma: no cover
+                    return bool(offset)
+                offset += sent
+            return True
+        finally:
+            os.close(sfd)
+
     def _failure(self):
         _FileCloser._failure(self)
+
+
+# From <linux/fcntl.h>
+_AT_FDCWD = -100
+_RENAME_EXCHANGE = 2
+
+# From <linux/fs.h>
+_FICLONE = 0x40049409
+
+_O_TMPFILE = getattr(os, 'O_TMPFILE', 0)
+
+
+def _fsync_directory(parent):
+    """Persist a directory entry change, where the platform allows it"""
+    if hasattr(os, 'O_DIRECTORY'):
+        fd = os.open(parent or os.curdir, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+@functools.lru_cache()
+def _renameat2():
+    """Return libc's renameat2, or None if it is unavailable"""
+    if sys.platform != 'linux':
+        return None
+
+    import ctypes
+
+    try:
+        libc = ctypes.CDLL('libc.so.6', use_errno=True)
+        return libc.renameat2
+    except (AttributeError, OSError):
+        return None
+
+
+def _exchange(temp_file, target_file):
+    """Atomically swap two existing files, returning True on success"""
+    renameat2 = _renameat2()
+    if renameat2 is None:
+        return False
+
+    result = renameat2(
+        _AT_FDCWD,
+        os.fsencode(temp_file),
+        _AT_FDCWD,
+        os.fsencode(target_file),
+        _RENAME_EXCHANGE,
+    )
+    return result == 0
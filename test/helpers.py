@@ -1,4 +1,19 @@
 import functools
+import os
+
+
+def names(path='.'):
+    with os.scandir(path) as it:
+        return frozenset(e.name for e in it)
+
+
+def read(path):
+    # One open and one read: the test payloads are far smaller than 4K
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, 4096)
+    finally:
+        os.close(fd)
 
 
 def temps(opener):
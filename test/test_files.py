@@ -1,95 +1,223 @@
 import os
+import shutil
+import tempfile
 import unittest
 from pathlib import Path
 
-import tdir
-
 import safer
 
+from . import helpers
+
 FILENAME = Path('one')
 
 
-@tdir
+def _o_tmpfile_works():
+    if not hasattr(os, 'O_TMPFILE'):
+        return False
+    try:
+        fd = os.open('.', os.O_TMPFILE | os.O_WRONLY, 0o666)
+    except OSError:
+        return False
+    os.close(fd)
+    return True
+
+
 class TestSaferFiles(unittest.TestCase):
+    # One directory for the whole class: each test starts by wiping it,
+    # which is much cheaper than a mkdtemp/rmtree cycle per test
+    @classmethod
+    def setUpClass(cls):
+        cls._td = tempfile.mkdtemp()
+        cls._old_cwd = os.getcwd()
+        os.chdir(cls._td)
+
+    @classmethod
+    def tearDownClass(cls):
+        os.chdir(cls._old_cwd)
+        shutil.rmtree(cls._td)
+
+    def setUp(self):
+        for entry in os.scandir('.'):
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path)
+            else:
+                os.unlink(entry.path)
+
     def test_all_modes(self):
         modes = 'w', 'r', 'a', 'r+', 'w+', 'a', 'a+'
+        FILENAME.touch()
 
         for m in modes:
-            with safer.open(FILENAME, m, temp_file=True):
-                pass
-            with safer.open(FILENAME, m + 'b', temp_file=True):
-                pass
+            for binary in ('', 'b'):
+                with self.subTest(mode=m + binary):
+                    with safer.open(FILENAME, m + binary, temp_file=True):
+                        pass
 
     def test_explicit_close(self):
-        FILENAME.write_text('hello')
-        assert FILENAME.read_text() == 'hello'
-        before = set(os.listdir('.'))
+        FILENAME.write_bytes(b'hello')
+        assert FILENAME.read_bytes() == b'hello'
+        before = helpers.names()
 
         fp = safer.open(FILENAME, 'w', temp_file=True)
         fp.write('OK!')
-        assert FILENAME.read_text() == 'hello'
+        assert FILENAME.read_bytes() == b'hello'
 
-        after = set(os.listdir('.'))
-        assert len(before) + 1 == len(after)
-        assert len(after.difference(before)) == 1
+        after = helpers.names()
+        assert after > before and len(after) - len(before) == 1
 
         fp.close()
 
-        self.assertEqual(FILENAME.read_text(), 'OK!')
-        assert FILENAME.read_text() == 'OK!'
-        after = set(os.listdir('.'))
+        self.assertEqual(FILENAME.read_bytes(), b'OK!')
+        assert FILENAME.read_bytes() == b'OK!'
+        after = helpers.names()
         assert before == after
 
-    def test_temp_file1(self):
+    def test_temp_file(self):
         temp_file = FILENAME.with_suffix('.temp_file')
-        with safer.open(FILENAME, 'w', temp_file=temp_file) as fp:
-            assert temp_file.exists()
-            assert os.path.exists(temp_file)
-            fp.write('hello')
+        cases = (
+            (True, False),
+            (True, True),
+            (False, False),
+            (False, True),
+        )
 
-        assert FILENAME.read_text() == 'hello'
-        assert not temp_file.exists()
+        for delete_failures, raise_error in cases:
+            with self.subTest(delete_failures=delete_failures, raise_error=raise_error):
+                FILENAME.unlink(missing_ok=True)
+                temp_file.unlink(missing_ok=True)
 
-    def test_temp_file2(self):
-        temp_file = FILENAME.with_suffix('.temp_file')
+                try:
+                    with safer.open(
+                        FILENAME,
+                        'w',
+                        temp_file=temp_file,
+                        delete_failures=delete_failures,
+                    ) as fp:
+                        assert temp_file.exists()
+                        fp.write('hello')
+                        if raise_error:
+                            raise ValueError('Expected')
+                except ValueError as e:
+                    assert e.args[0] == 'Expected'
 
-        with self.assertRaises(ValueError) as e:
-            with safer.open(FILENAME, 'w', temp_file=temp_file) as fp:
-                assert temp_file.exists()
-                fp.write('hello')
-                raise ValueError('Expected')
-        assert e.exception.args[0] == 'Expected'
+                if raise_error:
+                    assert not FILENAME.exists()
+                    assert temp_file.exists() == (not delete_failures)
+                else:
+                    assert FILENAME.read_bytes() == b'hello'
+                    assert not temp_file.exists()
 
-        assert not FILENAME.exists()
-        assert not temp_file.exists()
+    def test_unnamed_temp_file(self):
+        if not _o_tmpfile_works():
+            self.skipTest('This test requires Linux O_TMPFILE support')
 
-    def test_temp_file3(self):
-        temp_file = FILENAME.with_suffix('.temp_file')
+        FILENAME.write_bytes(b'hello')
+        before = helpers.names()
+
+        fp = safer.open(FILENAME, 'w', unnamed_temp_file=True)
+        fp.write('OK!')
+        assert helpers.names() == before
+        fp.close()
+
+        assert FILENAME.read_bytes() == b'OK!'
+        assert helpers.names() == before
+
+    def test_unnamed_temp_file_new(self):
+        if not _o_tmpfile_works():
+            self.skipTest('This test requires Linux O_TMPFILE support')
+
+        with safer.open(FILENAME, 'w', unnamed_temp_file=True) as fp:
+            fp.write('hello')
+        assert FILENAME.read_bytes() == b'hello'
+        assert helpers.names() == {'one'}
+
+    def test_unnamed_dry_run_callable(self):
+        if not _o_tmpfile_works():
+            self.skipTest('This test requires Linux O_TMPFILE support')
+
+        results = []
         with safer.open(
-            FILENAME, 'w', temp_file=temp_file, delete_failures=False
+            FILENAME, 'w', unnamed_temp_file=True, dry_run=results.append
         ) as fp:
-            assert os.path.exists(temp_file)
             fp.write('hello')
 
-        assert FILENAME.read_text() == 'hello'
-        assert not temp_file.exists()
+        assert not FILENAME.exists()
+        assert results == ['hello']
 
-    def test_temp_file4(self):
-        temp_file = FILENAME.with_suffix('.temp_file')
-        with self.assertRaises(ValueError) as e:
+    def test_mode_x_race(self):
+        fp = safer.open(FILENAME, 'x', temp_file=True)
+        fp.write('hello')
+        FILENAME.write_bytes(b'sneaky')
+
+        with self.assertRaises(FileExistsError):
+            fp.close()
+
+        assert FILENAME.read_bytes() == b'sneaky'
+        assert helpers.names() == {'one'}
+
+    def test_mode_x_race_unnamed(self):
+        if not _o_tmpfile_works():
+            self.skipTest('This test requires Linux O_TMPFILE support')
+
+        fp = safer.open(FILENAME, 'x', unnamed_temp_file=True)
+        fp.write('hello')
+        FILENAME.write_bytes(b'sneaky')
+
+        with self.assertRaises(FileExistsError):
+            fp.close()
+
+        assert FILENAME.read_bytes() == b'sneaky'
+        assert helpers.names() == {'one'}
+
+    def test_fsync(self):
+        FILENAME.write_bytes(b'hello')
+        with safer.open(FILENAME, 'w', temp_file=True, fsync=True) as fp:
+            fp.write('OK!')
+        assert FILENAME.read_bytes() == b'OK!'
+
+    def test_swap_atomic(self):
+        FILENAME.write_bytes(b'hello')
+        with safer.open(FILENAME, 'w', temp_file=True, swap_atomic=True) as fp:
+            fp.write('OK!')
+        assert FILENAME.read_bytes() == b'OK!'
+        assert helpers.names() == {'one'}
+
+    def test_swap_atomic_new_file(self):
+        with safer.open(FILENAME, 'w', temp_file=True, swap_atomic=True) as fp:
+            fp.write('hello')
+        assert FILENAME.read_bytes() == b'hello'
+        assert helpers.names() == {'one'}
+
+    def test_expected_size(self):
+        with safer.open(FILENAME, 'w', temp_file=True, expected_size=1024) as fp:
+            fp.write('hello')
+        assert FILENAME.read_bytes() == b'hello'
+        assert FILENAME.stat().st_size == 5
+
+    def test_expected_sha256(self):
+        import hashlib
+
+        good = hashlib.sha256(b'hello').hexdigest()
+        with safer.open(FILENAME, 'w', temp_file=True, expected_sha256=good) as fp:
+            fp.write('hello')
+        assert FILENAME.read_bytes() == b'hello'
+
+        with self.assertRaises(IOError):
             with safer.open(
-                FILENAME, 'w', temp_file=temp_file, delete_failures=False
+                FILENAME, 'w', temp_file=True, expected_sha256=64 * '0'
             ) as fp:
-                assert os.path.exists(temp_file)
-                fp.write('hello')
-                raise ValueError('Expected')
-        assert e.exception.args[0] == 'Expected'
+                fp.write('corrupt')
 
-        assert not FILENAME.exists()
-        assert temp_file.exists()
+        assert FILENAME.read_bytes() == b'hello'
+        assert helpers.names() == {'one'}
+
+    def test_write_through(self):
+        with safer.open(FILENAME, 'w', temp_file=True, write_through=True) as fp:
+            fp.write('hello')
+        assert FILENAME.read_bytes() == b'hello'
 
     def test_read(self):
-        FILENAME.write_text('hello')
+        FILENAME.write_bytes(b'hello')
         with safer.open(FILENAME, 'r+', temp_file=True) as fp:
             assert fp.read() == 'hello'
 
@@ -104,27 +232,26 @@ class TestSaferFiles(unittest.TestCase):
         arg = m.exception.args[0]
         assert arg == '`name` must be string, not int'
 
-    def _error(self, mode='w', **kwds):
-        with self.assertRaises(ValueError) as e:
-            safer.open(FILENAME, mode, temp_file=True, **kwds)
-        return e.exception.args[0]
-
-    def test_errors1(self):
-        a = self._error(closefd=False)
-        assert a == 'Cannot use closefd=False with file name'
-
-    def test_errors2(self):
-        a = self._error('bt')
-        assert a == "can't have text and binary mode at once"
-
-    def test_errors3(self):
-        a = self._error('wb', newline=True)
-        assert a == "binary mode doesn't take a newline argument"
-
-    def test_errors4(self):
-        a = self._error('wb', encoding='utf8')
-        assert a == "binary mode doesn't take an encoding argument"
+    def test_errors(self):
+        cases = (
+            ('w', {'closefd': False}, 'Cannot use closefd=False with file name'),
+            ('bt', {}, "can't have text and binary mode at once"),
+            ('wb', {'newline': True}, "binary mode doesn't take a newline argument"),
+            (
+                'wb',
+                {'encoding': 'utf8'},
+                "binary mode doesn't take an encoding argument",
+            ),
+            ('wb', {'errors': True}, "binary mode doesn't take an errors argument"),
+            (
+                'wb',
+                {'write_through': True},
+                "binary mode doesn't take a write_through argument",
+            ),
+        )
 
-    def test_errors5(self):
-        a = self._error('wb', errors=True)
-        assert a == "binary mode doesn't take an errors argument"
+        for mode, kwds, expected in cases:
+            with self.subTest(mode=mode, kwds=kwds):
+                with self.assertRaises(ValueError) as e:
+                    safer.open(FILENAME, mode, temp_file=True, **kwds)
+                assert e.exception.args[0] == expected
@@ -35,18 +35,18 @@ class TestSafer(unittest.TestCase):
     def test_open(self, safer_open):
         with safer_open(FILENAME, 'w') as fp:
             fp.write('hello')
-        assert FILENAME.read_text() == 'hello'
+        assert helpers.read(FILENAME) == b'hello'
 
     def test_no_copy(self, safer_open):
         with safer_open(FILENAME, 'a') as fp:
             fp.write('hello')
-        assert FILENAME.read_text() == 'hello'
+        assert helpers.read(FILENAME) == b'hello'
 
     def test_copy(self, safer_open):
-        FILENAME.write_text('c')
+        FILENAME.write_bytes(b'c')
         with safer_open(FILENAME, 'a') as fp:
             fp.write('hello')
-        assert FILENAME.read_text() == 'chello'
+        assert helpers.read(FILENAME) == b'chello'
 
     def test_open_dry(self, safer_open):
         results = []
@@ -61,20 +61,20 @@ class TestSafer(unittest.TestCase):
         assert not FILENAME.exists()
 
     def test_copy_dry(self, safer_open):
-        FILENAME.write_text('c')
+        FILENAME.write_bytes(b'c')
         with safer_open(FILENAME, 'a', dry_run=True) as fp:
             fp.write('hello')
-        assert FILENAME.read_text() == 'c'
+        assert helpers.read(FILENAME) == b'c'
 
     def test_error(self, safer_open):
-        FILENAME.write_text('hello')
+        FILENAME.write_bytes(b'hello')
 
         with self.assertRaises(ValueError):
             with safer_open(FILENAME, 'w') as fp:
                 fp.write('GONE')
                 raise ValueError
 
-        assert FILENAME.read_text() == 'hello'
+        assert helpers.read(FILENAME) == b'hello'
 
     def test_make_parents(self, safer_open):
         FILENAME = Path('foo/test.txt')
@@ -84,23 +84,23 @@ class TestSafer(unittest.TestCase):
 
         with safer_open(FILENAME, 'w', make_parents=True) as fp:
             fp.write('hello')
-        assert FILENAME.read_text() == 'hello'
+        assert helpers.read(FILENAME) == b'hello'
 
     def test_two_errors(self, safer_open):
         uses_files = safer_open is not safer.open
 
-        FILENAME.write_text('hello')
+        FILENAME.write_bytes(b'hello')
         if uses_files:
-            before = set(os.listdir('.'))
+            before = helpers.names()
 
         with self.assertRaises(ValueError):
             with safer_open(FILENAME, 'w') as fp:
                 fp.write('GONE')
                 raise ValueError
-        assert FILENAME.read_text() == 'hello'
+        assert helpers.read(FILENAME) == b'hello'
 
         if uses_files:
-            after = set(os.listdir('.'))
+            after = helpers.names()
             assert before == after
 
         with self.assertRaises(ValueError):
@@ -108,43 +108,40 @@ class TestSafer(unittest.TestCase):
                 fp.write('GONE')
                 raise ValueError
 
-        assert FILENAME.read_text() == 'hello'
+        assert helpers.read(FILENAME) == b'hello'
 
         if uses_files:
-            after = set(os.listdir('.'))
-            assert len(before) + 1 == len(after)
-            assert len(after.difference(before)) == 1
+            after = helpers.names()
+            assert after > before and len(after) - len(before) == 1
 
         with safer_open(FILENAME, 'w') as fp:
             fp.write('OK!')
             if uses_files:
-                after = set(os.listdir('.'))
-                assert len(before) + 1 == len(after)
-                assert len(after.difference(before)) == 1
+                # The saved failure file plus this writer's own temp file
+                after = helpers.names()
+                assert after > before and len(after) - len(before) == 2
 
-        assert FILENAME.read_text() == 'OK!'
+        assert helpers.read(FILENAME) == b'OK!'
 
         if uses_files:
-            after = set(os.listdir('.'))
-            assert len(before) == len(after)
-            assert len(after.difference(before)) == 0
+            # Temp names are randomized, so the saved failure file survives
+            after = helpers.names()
+            assert after > before and len(after) - len(before) == 1
 
     def test_error_with_copy(self, safer_open):
-        FILENAME.write_text('hello')
+        FILENAME.write_bytes(b'hello')
 
         with self.assertRaises(ValueError):
             with safer_open(FILENAME, 'a') as fp:
                 fp.write('GONE')
                 raise ValueError
 
-        assert FILENAME.read_text() == 'hello'
+        assert helpers.read(FILENAME) == b'hello'
 
     def test_file_perms(self, safer_open):
-        Path('test2.txt').write_text('hello')
-
         with safer_open(FILENAME, 'w') as fp:
             fp.write('hello')
-        assert FILENAME.read_text() == 'hello'
+        assert helpers.read(FILENAME) == b'hello'
         mode = os.stat(FILENAME).st_mode
 
         if os.name == 'posix':
@@ -158,12 +155,12 @@ class TestSafer(unittest.TestCase):
         os.chmod(FILENAME, new_mode)
         with safer_open(FILENAME, 'w') as fp:
             fp.write('bye')
-        assert FILENAME.read_text() == 'bye'
+        assert helpers.read(FILENAME) == b'bye'
         assert os.stat(FILENAME).st_mode == new_mode
 
         with safer_open(FILENAME, 'a') as fp:
             fp.write(' there')
-        assert FILENAME.read_text() == 'bye there'
+        assert helpers.read(FILENAME) == b'bye there'
         assert os.stat(FILENAME).st_mode == new_mode
 
     def test_line_buffering(self, safer_open):
@@ -195,7 +192,7 @@ class TestSafer(unittest.TestCase):
     def test_mode_x(self, safer_open):
         with safer_open(FILENAME, 'x') as fp:
             fp.write('hello')
-        assert FILENAME.read_text() == 'hello'
+        assert helpers.read(FILENAME) == b'hello'
 
         with self.assertRaises(FileExistsError):
             with safer_open(FILENAME, 'x') as fp:
@@ -204,41 +201,41 @@ class TestSafer(unittest.TestCase):
     def test_mode_t(self, safer_open):
         with safer_open(FILENAME, 'wt') as fp:
             fp.write('hello')
-        assert FILENAME.read_text() == 'hello'
+        assert helpers.read(FILENAME) == b'hello'
 
     @skip_if_symlink_creation_forbidden
     def test_symlink_file(self, safer_open):
         with safer_open(FILENAME, 'w') as fp:
             fp.write('hello')
-        assert FILENAME.read_text() == 'hello'
+        assert helpers.read(FILENAME) == b'hello'
 
         sym_filename = FILENAME.with_suffix('.sym')
         os.symlink(FILENAME, sym_filename)
         with safer_open(sym_filename, 'w') as fp:
             fp.write('overwritten')
-        assert FILENAME.read_text() == 'overwritten'
+        assert helpers.read(FILENAME) == b'overwritten'
 
     @skip_if_symlink_creation_forbidden
     def test_symlink_directory(self, safer_open):
         FILENAME = Path('sub/test.txt')
         with safer_open(FILENAME, 'w', make_parents=True) as fp:
             fp.write('hello')
-        assert FILENAME.read_text() == 'hello'
+        assert helpers.read(FILENAME) == b'hello'
         os.symlink(Path('sub'), Path('sub.sym'), target_is_directory=True)
 
         sym_filename = Path('sub.sym/test.txt')
         with safer_open(sym_filename, 'w') as fp:
             fp.write('overwritten')
-        assert FILENAME.read_text() == 'overwritten'
+        assert helpers.read(FILENAME) == b'overwritten'
 
     def test_file_exists_error(self, safer_open):
         with safer_open(FILENAME, 'wt') as fp:
             fp.write('hello')
-        assert FILENAME.read_text() == 'hello'
+        assert helpers.read(FILENAME) == b'hello'
 
         with safer_open(FILENAME, 'wt') as fp:
             fp.write('goodbye')
-        assert FILENAME.read_text() == 'goodbye'
+        assert helpers.read(FILENAME) == b'goodbye'
 
     def test_tempfile_perms(self, safer_open):
         temp_files = False, True, 'three'
@@ -256,3 +253,13 @@ class TestSafer(unittest.TestCase):
             assert perms[0] == 0o100666
         else:
             assert perms[0] in (0o100644, 0o100664)
+
+
+@tdir
+def test_spool():
+    # spool_max picks the temp strategy itself, so there is no
+    # temp_file variant to run through helpers.temps
+    with safer.open(FILENAME, 'w', spool_max=4) as fp:
+        fp.write('one')
+        fp.write('two')  # Rolls over to disk here
+    assert helpers.read(FILENAME) == b'onetwo'
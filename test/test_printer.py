@@ -1,19 +1,35 @@
 import functools
+import os
+import shutil
+import tempfile
 from pathlib import Path
 from unittest import TestCase
 
-import tdir
-
 import safer
 
 topen = functools.partial(safer.open, temp_file=True)
 copen = functools.partial(safer.open, mode='w')
 
 
-@tdir
 class TestPrinter(TestCase):
     filename = Path('test.txt')
 
+    # One directory for the whole class; each test only needs a clean
+    # self.filename, so setUp unlinks it instead of rebuilding a tempdir
+    @classmethod
+    def setUpClass(cls):
+        cls._td = tempfile.mkdtemp()
+        cls._old_cwd = os.getcwd()
+        os.chdir(cls._td)
+
+    @classmethod
+    def tearDownClass(cls):
+        os.chdir(cls._old_cwd)
+        shutil.rmtree(cls._td)
+
+    def setUp(self):
+        self.filename.unlink(missing_ok=True)
+
     def test_printer(self):
         with safer.printer(self.filename) as print:
             print('hello')
@@ -2,7 +2,6 @@ import sys
 import unittest
 from pathlib import Path
 
-import pytest
 import tdir
 
 import safer
@@ -168,6 +167,23 @@ class TestWriter(unittest.TestCase):
 
         assert results == ['onetwo']
 
+    def test_spool(self, safer_writer):
+        results = []
+        with safer_writer(results.append, spool_max=4) as fp:
+            fp.write('one')
+            fp.write('two')  # Rolls over to disk here
+            fp.write('!')
+        assert results == ['onetwo!']
+
+    def test_spool_error(self, safer_writer):
+        results = []
+        with self.assertRaises(ValueError):
+            with safer_writer(results.append, spool_max=4) as fp:
+                fp.write('one')
+                fp.write('two')
+                raise ValueError
+        assert results == []
+
     def test_partial_writes(self, safer_writer):
         results = []
 
@@ -197,26 +213,22 @@ def test_wrapper_bug():
 
 @tdir
 def test_wrapper_bug2():
-    with pytest.raises(NotImplementedError) as e:
-        with open(FILENAME, 'w') as fp:
-            safer.writer(fp, close_on_exit=True, temp_file=True)
-    assert e.value.args == (safer.BUG_MESSAGE,)
+    with open(FILENAME, 'w') as fp:
+        with safer.writer(fp, close_on_exit=True, temp_file=True) as fp2:
+            fp2.write('hello, world')
+    assert FILENAME.read_text() == 'hello, world'
 
 
 @tdir
 def test_wrapper_bug3():
-    try:
-        bug, safer.BUG_MESSAGE = safer.BUG_MESSAGE, None
-        with safer.writer(FILENAME) as fp:
-            fp.write('hello, world')
-        assert FILENAME.read_text() == 'hello, world'  # OK!
+    with safer.writer(FILENAME) as fp:
+        fp.write('hello, world')
+    assert FILENAME.read_text() == 'hello, world'  # OK!
 
-        with open(FILENAME, 'w') as fp:
-            with safer.writer(fp, close_on_exit=True, temp_file=True):
-                fp.write('')
-        assert FILENAME.read_text() == ''
-    finally:
-        safer.BUG_MESSAGE = bug
+    with open(FILENAME, 'w') as fp:
+        with safer.writer(fp, close_on_exit=True, temp_file=True):
+            fp.write('')
+    assert FILENAME.read_text() == ''
 
 
 @helpers.temps(safer.closer)